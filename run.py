@@ -1,12 +1,22 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import gspread
+import requests
 from oauth2client.service_account import ServiceAccountCredentials
-import json
-import random
+import orjson
+import base64
+import hashlib
+import hmac
+import numpy as np
 import uuid
 import datetime
-from cryptography.fernet import Fernet
+import atexit
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Final
 
 # --------------------------------------------------------------------------
 # 1. 설정 및 UI 스타일링 (CSS 수정)
@@ -15,24 +25,12 @@ from cryptography.fernet import Fernet
 st.set_page_config(layout="wide", page_title="EQ Survey")
 
 try:
-    SECRET_KEY = st.secrets["general"]["encryption_key"]
-    cipher_suite = Fernet(SECRET_KEY)
+    SECRET_KEY = st.secrets["general"]["encryption_key"].encode('utf-8')
 except KeyError:
     st.error("암호화 키(encryption_key)가 secrets.toml에 설정되지 않았습니다.")
     st.stop()
 
-# 뒤로가기 감지 스크립트 (이전 요청사항 유지)
-js_code = """
-<script>
-    window.parent.addEventListener('popstate', function(event) {
-        window.parent.location.reload();
-    });
-</script>
-"""
-components.html(js_code, height=0)
-
-st.markdown("""
-    <style>
+_CSS: Final = """
     /* 1. 컬럼 내부 요소 중앙 정렬 (이미지와 버튼의 축을 맞춤) */
     div[data-testid="column"] {
         display: flex;
@@ -71,26 +69,60 @@ st.markdown("""
         color: #aaa;
     }
     .stApp > header {visibility: hidden;}
-    </style>
-    """, unsafe_allow_html=True)
+"""
+
+# 뒤로가기 감지 스크립트 (이전 요청사항 유지) + 스타일 적용
+# 세션당 1회만 iframe을 생성하므로, iframe이 제거된 뒤에도 유지되도록 리스너와 스타일을 부모 문서에 직접 설치
+_JS: Final = """
+<script>
+    const doc = window.parent.document;
+    if (!doc.getElementById('popstate-reload')) {
+        const script = doc.createElement('script');
+        script.id = 'popstate-reload';
+        script.textContent = "window.addEventListener('popstate', function(event) { window.location.reload(); });";
+        doc.head.appendChild(script);
+    }
+    if (!doc.getElementById('survey-style')) {
+        const style = doc.createElement('style');
+        style.id = 'survey-style';
+        style.textContent = __CSS__;
+        doc.head.appendChild(style);
+    }
+</script>
+"""
+if not st.session_state.get("_assets_installed"):
+    # CSS 삽입은 실제로 설치할 때(세션 첫 실행)만 수행
+    components.html(_JS.replace("__CSS__", orjson.dumps(_CSS).decode('utf-8')), height=0)
+    st.session_state["_assets_installed"] = True
 
 # --------------------------------------------------------------------------
 # 2. 데이터 및 연결 관리
 # --------------------------------------------------------------------------
 
-def encrypt_state(data_dict):
-    """딕셔너리 -> JSON 문자열 -> 암호화 -> URL Safe 문자열"""
-    json_str = json.dumps(data_dict)
-    token = cipher_suite.encrypt(json_str.encode('utf-8'))
-    return token.decode('utf-8')
+SIG_SIZE = 12  # 토큰에 붙이는 HMAC-SHA256 서명 길이 (바이트)
+
+def _state_sig(payload):
+    return hmac.new(SECRET_KEY, payload, hashlib.sha256).digest()[:SIG_SIZE]
+
+def sign_state(uid, step, ans):
+    """
+    상태 -> 'uid|step|ans' + HMAC 서명 -> URL Safe 문자열
+    상태에는 민감 정보가 없으므로 암호화 없이 위변조 여부만 검증
+    """
+    payload = f"{uid}|{step}|{ans}".encode('utf-8')
+    return base64.urlsafe_b64encode(payload + b"." + _state_sig(payload)).decode('ascii')
 
-def decrypt_state(token_str):
-    """URL Safe 문자열 -> 복호화 -> JSON 파싱 -> 딕셔너리"""
+def verify_state(token_str):
+    """URL Safe 문자열 -> 서명 검증 -> 딕셔너리"""
     try:
-        json_bytes = cipher_suite.decrypt(token_str.encode('utf-8'))
-        return json.loads(json_bytes.decode('utf-8'))
+        raw = base64.urlsafe_b64decode(token_str)
+        payload, sep, sig = raw[:-SIG_SIZE - 1], raw[-SIG_SIZE - 1:-SIG_SIZE], raw[-SIG_SIZE:]
+        if sep != b"." or not hmac.compare_digest(sig, _state_sig(payload)):
+            return None
+        uid, step, ans = payload.decode('utf-8').split("|")
+        return {"uid": uid, "step": int(step), "ans": ans}
     except Exception:
-        # URL이 조작되었거나 복호화 실패 시 None 반환
+        # URL이 조작되었거나 형식이 맞지 않으면 None 반환
         return None
 
 @st.cache_resource
@@ -106,156 +138,334 @@ def get_google_sheet():
         st.error(f"DB Error: {e}")
         return None
 
+logger = logging.getLogger(__name__)
+
+SUBMIT_FLUSH_INTERVAL = 2  # 제출 결과를 시트에 모아서 기록하는 주기 (초)
+SUBMIT_MAX_RETRIES = 10    # 일시적 오류(429/5xx/네트워크) 시 배치별 재시도 횟수
+SUBMIT_MAX_BACKOFF = 60    # 재시도 간격 상한 (초). 2, 4, 8, ... 60초로 총 약 5분간 재시도 (분당 쓰기 할당량 창보다 길게)
+
+def _append(sheet, rows):
+    # INSERT_ROWS: 기존 표 아래에 새 행으로 삽입 (RAW는 gspread 기본값과 같으며 명시만 함)
+    sheet.append_rows(
+        rows,
+        value_input_option='RAW',
+        insert_data_option='INSERT_ROWS',
+        table_range='A1',
+    )
+
+def _is_transient_error(e):
+    """나중에 다시 시도하면 성공할 수 있는 오류인지 (할당량 초과, 서버 오류, 네트워크 오류)"""
+    if isinstance(e, gspread.exceptions.APIError):
+        status = e.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(e, requests.exceptions.RequestException)
+
+class SubmitQueue:
+    """
+    제출 결과를 모아 주기적으로 한 번의 append_rows 호출로 시트에 기록하는 백그라운드 큐
+    (사용자마다 API를 호출하지 않으므로 쓰기 할당량을 아끼고, 제출 시 대기 없음)
+    - 일시적 오류: 배치별로 지수 백오프(최대 SUBMIT_MAX_BACKOFF초)하며 SUBMIT_MAX_RETRIES회까지 재시도
+    - 영구 오류: 한 행씩 다시 기록하여 문제가 되는 행만 제외
+    끝내 기록하지 못한 행은 JSON으로 로그에 남겨 수동 복구할 수 있게 함
+    """
+
+    def __init__(self, sheet, interval=SUBMIT_FLUSH_INTERVAL):
+        self.sheet = sheet
+        self.interval = interval
+        self.rows = queue.Queue()
+        self.batches = []  # 기록 대기 중인 배치: {"rows", "attempts", "next_try"}
+        self.lock = threading.Lock()
+        threading.Thread(target=self._run, daemon=True).start()
+        # 프로세스 종료 시 남은 행 기록 (백오프 대기 무시)
+        atexit.register(self.flush, force=True)
+
+    def put(self, row):
+        self.rows.put(row)
+
+    @property
+    def backlogged(self):
+        """기록에 실패하여 재시도 대기 중인 배치가 있는지"""
+        return any(batch["attempts"] > 0 for batch in self.batches)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self, force=False):
+        with self.lock:
+            new_rows = []
+            while True:
+                try:
+                    new_rows.append(self.rows.get_nowait())
+                except queue.Empty:
+                    break
+            if new_rows:
+                self.batches.append({"rows": new_rows, "attempts": 0, "next_try": 0})
+
+            now = time.monotonic()
+            for batch in list(self.batches):
+                if not force and batch["next_try"] > now:
+                    continue
+                try:
+                    _append(self.sheet, batch["rows"])
+                except Exception as e:
+                    if _is_transient_error(e):
+                        self._retry_later(batch, e)
+                        # 할당량 초과/장애 중에는 이번 주기의 나머지 배치도 보류
+                        break
+                    self.batches.remove(batch)
+                    self._append_one_by_one(batch["rows"], e)
+                else:
+                    self.batches.remove(batch)
+
+    def _retry_later(self, batch, e):
+        batch["attempts"] += 1
+        if batch["attempts"] >= SUBMIT_MAX_RETRIES:
+            self.batches.remove(batch)
+            self._drop(batch["rows"], e)
+            return
+        delay = min(self.interval * 2 ** batch["attempts"], SUBMIT_MAX_BACKOFF)
+        batch["next_try"] = time.monotonic() + delay
+        logger.warning(
+            "Sheet write failed (attempt %d/%d, %d rows, retry in %ds): %s",
+            batch["attempts"], SUBMIT_MAX_RETRIES, len(batch["rows"]), delay, e,
+        )
+
+    def _append_one_by_one(self, rows, batch_error):
+        """영구 오류 시 한 행씩 기록하여 문제가 되는 행만 제외"""
+        logger.warning("Sheet write failed for %d rows, retrying row by row: %s", len(rows), batch_error)
+        for row in rows:
+            try:
+                _append(self.sheet, [row])
+            except Exception as e:
+                if _is_transient_error(e):
+                    self.batches.append({"rows": [row], "attempts": 1, "next_try": time.monotonic() + self.interval})
+                else:
+                    self._drop([row], e)
+
+    def _drop(self, rows, e):
+        logger.error("Sheet write failed, dropping %d rows: %s", len(rows), e)
+        for row in rows:
+            logger.error("Dropped row: %s", orjson.dumps(row).decode('utf-8'))
+
+@st.cache_resource
+def get_submit_queue(_sheet):
+    return SubmitQueue(_sheet)
+
 def get_image_url(file_id):
     if not file_id: return None
     # 썸네일 API (속도 최적화)
     return f"https://lh3.googleusercontent.com/d/{file_id}=w2000"
 
-@st.cache_data
+def image_html(url):
+    """
+    st.image 대신 사용할 <img> 태그
+    공개 URL을 브라우저가 직접 로드하므로 Streamlit 미디어 파이프라인을 거치지 않음 (lazy 로드, async 디코딩)
+    """
+    return f'<img src="{url}" loading="lazy" decoding="async" style="width:100%">'
+
+@st.cache_resource
 def load_metadata():
+    """
+    pairs_list.json 로드 (프로세스당 1회, 참조로 공유)
+    cache_resource는 복사 없이 같은 객체를 반환하므로 튜플로 고정하여 읽기 전용으로 사용
+    """
     try:
-        with open('./pairs_list.json', 'r') as f:
-            return json.load(f)
-    except:
-        return []
+        raw_bytes = Path('./pairs_list.json').read_bytes()
+        data = orjson.loads(raw_bytes)
+    except Exception:
+        return ()
+    return tuple(tuple(tuple(pair) for pair in pairs) for pairs in data)
 
-# --------------------------------------------------------------------------
-# 3. 상태 관리 (암호화 적용)
-# --------------------------------------------------------------------------
+@st.cache_data(max_entries=1024)
+def build_plan(user_id, num_samples):
+    """
+    사용자별 설문 구성 생성 (user_id에 의해 결과가 고정되므로 캐시)
+    반환: (survey_plan, selected_img_indices, selected_distortion_indices)
+    """
+    raw_data = load_metadata()
+    # 사용자별 독립 RNG (uid는 16진수 문자열)
+    rng = np.random.default_rng(int(user_id, 16))
+
+    # 실제 데이터가 num_samples보다 작으면 조정
+    actual_samples = min(num_samples, len(raw_data))
 
-# URL에서 'q' 파라미터 읽기
-encrypted_token = st.query_params.get("q")
-state_data = None
+    # 1. 전체 풀(0~36)에서 7개의 인덱스를 무작위 비복원 추출
+    # 시드가 고정되어 있으므로, F5를 눌러도 이 사용자는 항상 같은 7문제를 풉니다.
+    img_indices = rng.choice(len(raw_data), size=actual_samples, replace=False)
 
-if encrypted_token:
-    state_data = decrypt_state(encrypted_token)
+    # 2. 뽑힌 7개 이미지에 대해 왜곡 페어(A vs B)를 한 번에 선택 (페어가 없는 이미지는 -1)
+    lens = np.fromiter((len(raw_data[i]) for i in img_indices), dtype=np.int64, count=actual_samples)
+    distortion_indices = np.where(lens > 0, rng.integers(0, np.maximum(lens, 1)), -1)
 
-# 상태 데이터가 없거나 복호화 실패 시 초기화
-if not state_data:
-    new_uid = uuid.uuid4().hex[:6]
-    initial_state = {
-        "uid": new_uid,
-        "step": -1,
-        "ans": ""
-    }
-    # 초기 상태를 암호화하여 URL에 반영
-    encrypted_init = encrypt_state(initial_state)
-    st.query_params["q"] = encrypted_init
-    
-    # 변수 할당
-    user_id = new_uid
-    current_step = -1
-    saved_answers_str = ""
-else:
-    # 복호화 성공 시 변수 할당
-    user_id = state_data["uid"]
-    current_step = int(state_data["step"])
-    saved_answers_str = state_data["ans"]
+    selected_img_indices = img_indices.tolist()
+    selected_distortion_indices = distortion_indices.tolist()
 
-# 랜덤 시드 고정
-random.seed(user_id) # 사용자별 랜덤 고정
-raw_data = load_metadata()
+    # 선택된 7개의 (GT, A, B) 이미지 URL 리스트
+    # 이미지 URL도 여기서 미리 생성하여 캐시 (재실행마다 문자열 생성 방지)
+    survey_plan = [
+        tuple(get_image_url(file_id) for file_id in raw_data[img_idx][r_idx]) if r_idx >= 0 else None
+        for img_idx, r_idx in zip(selected_img_indices, selected_distortion_indices)
+    ]
 
-NUM_SAMPLES = 7 
-POOL_SIZE = len(raw_data)      # 전체 이미지 개수 (JSON 파일의 데이터 수)
+    return tuple(survey_plan), tuple(selected_img_indices), tuple(selected_distortion_indices)
 
-# 실제 데이터가 POOL_SIZE보다 작으면 조정
-actual_pool_size = len(raw_data) if raw_data else 0
-actual_samples = min(NUM_SAMPLES, actual_pool_size)
+# --------------------------------------------------------------------------
+# 3. 상태 관리 (서명 적용)
+# --------------------------------------------------------------------------
 
-survey_plan = []        # 선택된 7개의 [GT, A, B] ID 리스트
-selected_img_indices = [] # 선택된 7개의 원본 이미지 인덱스 (0~36 중 7개)
-selected_distortion_indices = [] # 선택된 7개의 왜곡 페어 인덱스
+NUM_SAMPLES = 7 
+# 미응답 문항 표시 (답변은 NUM_SAMPLES 길이의 고정 폭 문자열로 관리)
+EMPTY_ANSWERS = "-" * NUM_SAMPLES
+
+URL_SYNC_INTERVAL = 5  # 진행 상태를 URL 토큰에 반영하는 문항 간격
+
+def sync_url():
+    """현재 진행 상태를 서명하여 URL 'q' 파라미터에 반영 (새로고침/재접속 시 복원용)"""
+    st.query_params["q"] = sign_state(
+        st.session_state["uid"], st.session_state["step"], st.session_state["ans"]
+    )
+
+# 세션 최초 실행 시에만 URL에서 상태 복원 (이후에는 session_state가 기준)
+if "uid" not in st.session_state:
+    # URL에서 'q' 파라미터 읽기
+    state_token = st.query_params.get("q")
+    state_data = None
+
+    if state_token:
+        state_data = verify_state(state_token)
+
+    if state_data:
+        # 서명 검증 성공 시 상태 복원
+        st.session_state["uid"] = state_data["uid"]
+        st.session_state["step"] = int(state_data["step"])
+        st.session_state["ans"] = state_data["ans"]
+    else:
+        # 상태 데이터가 없거나 검증 실패 시 초기화하고 URL에 반영
+        st.session_state["uid"] = uuid.uuid4().hex[:6]
+        st.session_state["step"] = -1
+        st.session_state["ans"] = EMPTY_ANSWERS
+        sync_url()
+
+user_id = st.session_state["uid"]
+current_step = st.session_state["step"]
+saved_answers_str = st.session_state["ans"]
+
+# 소개 페이지(step -1)에서는 메타데이터/설문 구성이 필요 없으므로 건너뜀
+if current_step >= 0:
+    if not load_metadata():
+        st.error("No Data.")
+        st.stop()
 
-if raw_data:
-    # 1. 전체 풀(0~36)에서 7개의 인덱스를 무작위 비복원 추출
-    # random.sample을 쓰면 중복 없이 7개를 뽑습니다.
-    all_indices = list(range(actual_pool_size))
-    # 시드가 고정되어 있으므로, F5를 눌러도 이 사용자는 항상 같은 7문제를 풉니다.
-    selected_img_indices = random.sample(all_indices, actual_samples)
-    
-    # 2. 뽑힌 7개 이미지에 대해 왜곡 페어(A vs B) 설정
-    for img_idx in selected_img_indices:
-        pairs = raw_data[img_idx]
-        if pairs:
-            # 해당 이미지의 여러 왜곡 쌍 중 하나 선택
-            r_idx = random.randrange(len(pairs))
-            selected_distortion_indices.append(r_idx)
-            survey_plan.append(pairs[r_idx])
-        else:
-            selected_distortion_indices.append(-1)
-            survey_plan.append(None)
-else:
-    st.error("No Data.")
-    st.stop()
+    survey_plan, selected_img_indices, selected_distortion_indices = build_plan(user_id, NUM_SAMPLES)
 # --------------------------------------------------------------------------
 # 4. 로직 및 렌더링
 # --------------------------------------------------------------------------
 
 def start_survey():
     """소개 페이지 -> 설문 1번 문제로 이동"""
-    new_state = {
-        "uid": user_id,
-        "step": 0, # 0번 문제로 설정
-        "ans": ""  # 답변 초기화
-    }
-    token = encrypt_state(new_state)
-    st.query_params["q"] = token
+    # 0번 문제로 설정, 답변 초기화
+    st.session_state["step"] = 0
+    st.session_state["ans"] = EMPTY_ANSWERS
+    sync_url()
     st.rerun()
 
 def next_step(choice):
     """
-    다음 상태를 암호화하여 URL 업데이트
+    다음 상태를 session_state에 반영
+    URL 토큰은 URL_SYNC_INTERVAL 문항마다, 그리고 마지막 문항 응답 시에만 갱신
+    버튼 on_click 콜백으로 호출되며, 콜백 이후 Streamlit이 문항 fragment만 재실행함
     """
-    new_state = {
-        "uid": user_id,
-        "step": current_step + 1,
-        "ans": saved_answers_str + choice
-    }
-    
-    # 전체 상태를 묶어서 암호화
-    token = encrypt_state(new_state)
-    
-    # URL 쿼리 파라미터를 'q' 하나로 통일
-    st.query_params["q"] = token
-    st.rerun()
+    step = st.session_state["step"]
+    answers = st.session_state["ans"]
+
+    # 현재 문항 위치의 답변만 교체 (토큰 길이 일정 유지)
+    st.session_state["ans"] = answers[:step] + choice + answers[step + 1:]
+    st.session_state["step"] = step + 1
+
+    if (step + 1) % URL_SYNC_INTERVAL == 0 or step + 1 >= NUM_SAMPLES:
+        sync_url()
 
 def submit():
     sheet = get_google_sheet()
     if sheet:
-        with st.spinner("Saving..."):
-            try:
-                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                
-                # 답변 리스트 생성
-                final_answers = list(saved_answers_str)
-                
-                new_answers = []
-                for img_idx, distortion_idx, answer in zip(selected_img_indices, selected_distortion_indices, final_answers):
-                    new_answers.append(f'{img_idx}_{distortion_idx}_{answer}')
-
-                # [수정] 저장할 데이터 구성: 
-                # 타임스탬프 + UID + 답변리스트(37개) + 랜덤인덱스리스트(37개)
-                row_data = [timestamp, user_id] + new_answers
-                
-                sheet.append_row(row_data)
-                
-                st.session_state["submitted"] = True
-                st.success("Done!")
-                st.balloons()
-            except Exception as e:
-                st.error(f"Save Failed: {e}")
-# --- UI 렌더링 ---
+        try:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            
+            # 답변 리스트 생성 (미응답('-')은 빈 값으로 저장)
+            new_answers = [
+                f'{img_idx}_{distortion_idx}_{"" if answer == "-" else answer}'
+                for img_idx, distortion_idx, answer in zip(selected_img_indices, selected_distortion_indices, saved_answers_str)
+            ]
+
+            # [수정] 저장할 데이터 구성: 
+            # 타임스탬프 + UID + 답변리스트(37개) + 랜덤인덱스리스트(37개)
+            row_data = [timestamp, user_id] + new_answers
+            
+            submit_queue = get_submit_queue(sheet)
+            if submit_queue.backlogged:
+                # 백그라운드 기록이 실패 중이면 직접 기록하여 실패를 사용자에게 알림 (재제출 가능)
+                with st.spinner("Saving..."):
+                    _append(sheet, [row_data])
+            else:
+                # 큐에 넣고 바로 반환 (시트 기록은 백그라운드에서 일괄 처리)
+                # 이 경우 "Done!"은 접수 완료를 뜻하며, 기록 실패 시에는 서버 로그에만 남음
+                submit_queue.put(row_data)
+            
+            st.session_state["submitted"] = True
+            st.success("Done!")
+            st.balloons()
+        except Exception as e:
+            st.error(f"Save Failed: {e}")
+
+@st.fragment
+def question_view(survey_plan):
+    """문항 화면 (A/B 선택 시 이 영역만 재실행)"""
+    step = st.session_state["step"]
+
+    # 마지막 문항 응답 후에는 제출 화면을 위해 전체 재실행
+    if step >= NUM_SAMPLES:
+        st.rerun()
+
+    st.markdown(f"<h3 style='text-align: center;'>Sample {step + 1} / {NUM_SAMPLES}</h3>", unsafe_allow_html=True)
+
+    st.progress(min(step / NUM_SAMPLES, 1.0))
+
+    pair_urls = survey_plan[step]
+    
+    if not pair_urls:
+        next_step("N")
+        # 전체 실행(설문 시작 직후, 새로고침 후 복원) 중에도 호출되므로 scope="fragment"를 쓰지 않음
+        st.rerun()
 
+    url_gt, url_a, url_b = pair_urls
 
-if current_step == -1:
-    st.markdown("<br><br>", unsafe_allow_html=True) # 상단 여백
-    
-    # 중앙 정렬을 위한 컬럼 분할
-    _, col_main, _ = st.columns([1, 2, 1])
-    
-    with col_main:
-        st.markdown("""
+    c1, c2, c3 = st.columns([1, 1, 1], gap="medium")
+
+    with c1:
+        st.markdown("<div class='img-caption'>Option A</div>", unsafe_allow_html=True)
+        st.markdown(image_html(url_a), unsafe_allow_html=True)
+        st.button("Select A", key=f"a_{step}", use_container_width=True, on_click=next_step, args=("A",))
+
+    with c2:
+        st.markdown("<div class='img-caption' style='color:#E694FF;'>Ground Truth</div>", unsafe_allow_html=True)
+        st.markdown(image_html(url_gt), unsafe_allow_html=True)
+
+    with c3:
+        st.markdown("<div class='img-caption'>Option B</div>", unsafe_allow_html=True)
+        st.markdown(image_html(url_b), unsafe_allow_html=True)
+        st.button("Select B", key=f"b_{step}", use_container_width=True, on_click=next_step, args=("B",))
+
+    # 다음 문항 이미지를 미리 받아 브라우저 캐시에 적재 (응답 고민 시간 동안 로딩)
+    next_urls = survey_plan[step + 1] if step + 1 < len(survey_plan) else None
+    if next_urls:
+        prefetch_links = "".join(f'<link rel="prefetch" as="image" href="{url}">' for url in next_urls)
+        st.markdown(prefetch_links, unsafe_allow_html=True)
+
+# --- UI 렌더링 ---
+
+_INTRO_HTML: Final = f"""
         <div class="intro-box">
             <h1 style="text-align: center; color: #E694FF;">엣지 품질 평가 설문</h1>
             <hr style="border-color: #555;">
@@ -271,48 +481,24 @@ if current_step == -1:
                 <li>⚠️ 주의: 브라우저를 닫으면 진행 상황이 초기화될 수 있습니다.</li>
             </ul>
         </div>
-        """, unsafe_allow_html=True)
+"""
+
+
+if current_step == -1:
+    st.markdown("<br><br>", unsafe_allow_html=True) # 상단 여백
+    
+    # 중앙 정렬을 위한 컬럼 분할
+    _, col_main, _ = st.columns([1, 2, 1])
+    
+    with col_main:
+        st.markdown(_INTRO_HTML, unsafe_allow_html=True)
         
         # 시작 버튼
         if st.button("설문 시작하기 (Start)", type="primary"):
             start_survey()
 
 elif current_step < NUM_SAMPLES:
-    st.markdown(f"<h3 style='text-align: center;'>Sample {current_step + 1} / {NUM_SAMPLES}</h3>", unsafe_allow_html=True)
-
-    st.progress(min(current_step / NUM_SAMPLES, 1.0))
-
-    pair_ids = survey_plan[current_step]
-    
-    if not pair_ids:
-        next_step("N")
-        st.stop()
-
-    gt_id, dist_a_id, dist_b_id = pair_ids
-    
-    url_gt = get_image_url(gt_id)
-    url_a = get_image_url(dist_a_id)
-    url_b = get_image_url(dist_b_id)
-
-    c1, c2, c3 = st.columns([1, 1, 1], gap="medium")
-
-    with c1:
-        st.markdown("<div class='img-caption'>Option A</div>", unsafe_allow_html=True)
-        st.image(url_a, use_container_width=True)
-        with st.form(key=f"form_a_{current_step}", clear_on_submit=True):
-            if st.form_submit_button("Select A", use_container_width=True):
-                next_step("A")
-
-    with c2:
-        st.markdown("<div class='img-caption' style='color:#E694FF;'>Ground Truth</div>", unsafe_allow_html=True)
-        st.image(url_gt, use_container_width=True)
-
-    with c3:
-        st.markdown("<div class='img-caption'>Option B</div>", unsafe_allow_html=True)
-        st.image(url_b, use_container_width=True)
-        with st.form(key=f"form_b_{current_step}", clear_on_submit=True):
-            if st.form_submit_button("Select B", use_container_width=True):
-                next_step("B")
+    question_view(survey_plan)
 
 else:
     if st.session_state.get("submitted"):